@@ -1,20 +1,23 @@
 import logging
+import time
 import requests
 import json
 from openai import OpenAI
 
 from utils.retry import retry_with_key_rotation
+from utils.metering import get_active_meter, STAGE_MAPPING
 
 # ========================
 # Organization LLM Handler
 # ========================
-def call_org_llm(prompt: str, config: dict) -> str:
+def call_org_llm(prompt: str, config: dict, usage: dict = None) -> str:
     """
     Calls the organization's internal LLM API and returns the response.
 
     Args:
         prompt (str): Input prompt to send to the model.
         config (dict): Contains 'org_llm' keys: api_key, api_endpoint, model, temperature.
+        usage (dict): Optional dict that receives prompt/completion token counts.
 
     Returns:
         str: Textual response from the model.
@@ -40,6 +43,11 @@ def call_org_llm(prompt: str, config: dict) -> str:
         response_json = response.json()
         result = response_json.get("text") or response_json.get("response") or json.dumps(response_json)
 
+        reported = response_json.get("usage") or {}
+        if usage is not None and reported:
+            usage["prompt_tokens"] = reported.get("prompt_tokens", reported.get("input_tokens"))
+            usage["completion_tokens"] = reported.get("completion_tokens", reported.get("output_tokens"))
+
         logging.info("Received response from organization's internal LLM.")
         return result
     except Exception as e:
@@ -50,7 +58,7 @@ def call_org_llm(prompt: str, config: dict) -> str:
 # ========================
 # OpenAI LLM Handler
 # ========================
-def call_openai(prompt, api_key, model="gpt-3.5-turbo"):
+def call_openai(prompt, api_key, model="gpt-3.5-turbo", usage=None):
     """
     Calls OpenAI ChatCompletion API using the new SDK.
 
@@ -58,6 +66,7 @@ def call_openai(prompt, api_key, model="gpt-3.5-turbo"):
         prompt (str): The user prompt.
         api_key (str): OpenAI API key.
         model (str): Model to use (default: gpt-3.5-turbo).
+        usage (dict): Optional dict that receives prompt/completion token counts.
 
     Returns:
         str: The generated response.
@@ -71,6 +80,9 @@ def call_openai(prompt, api_key, model="gpt-3.5-turbo"):
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
         )
+        if usage is not None and response.usage is not None:
+            usage["prompt_tokens"] = response.usage.prompt_tokens
+            usage["completion_tokens"] = response.usage.completion_tokens
         return response.choices[0].message.content
     except Exception as e:
         logging.exception("OpenAI API call failed.")
@@ -80,13 +92,14 @@ def call_openai(prompt, api_key, model="gpt-3.5-turbo"):
 # ========================
 # Gemini LLM Handler
 # ========================
-def call_gemini(prompt, api_key):
+def call_gemini(prompt, api_key, usage=None):
     """
     Calls Gemini API to generate content.
 
     Args:
         prompt (str): The input prompt.
         api_key (str): Gemini API key.
+        usage (dict): Optional dict that receives prompt/completion token counts.
 
     Returns:
         str: Generated response text.
@@ -104,7 +117,13 @@ def call_gemini(prompt, api_key):
         )
         response.raise_for_status()
 
-        return response.json()["candidates"][0]["content"]["parts"][0]["text"]
+        response_json = response.json()
+        metadata = response_json.get("usageMetadata") or {}
+        if usage is not None and metadata:
+            usage["prompt_tokens"] = metadata.get("promptTokenCount")
+            usage["completion_tokens"] = metadata.get("candidatesTokenCount")
+
+        return response_json["candidates"][0]["content"]["parts"][0]["text"]
     except Exception as e:
         logging.exception("Gemini API call failed.")
         raise RuntimeError(f"Gemini call failed: {e}")
@@ -113,44 +132,89 @@ def call_gemini(prompt, api_key):
 # ========================
 # Unified LLM Dispatcher
 # ========================
-def get_llm_response(prompt, config):
+def _metered_attempt(meter, usage, key, provider_call, /, *args, **kwargs):
+    """
+    Runs one provider attempt: enforces the run budget before the request and
+    records the key used, whether the attempt succeeded and its duration in
+    `usage["attempts"]`.
+    """
+    if meter is not None:
+        meter.begin_attempt()
+    attempt = [key, False, 0.0]
+    usage["attempts"].append(attempt)
+    started = time.perf_counter()
+    try:
+        result = provider_call(*args, **kwargs)
+        attempt[1] = True
+        return result
+    finally:
+        attempt[2] = time.perf_counter() - started
+
+
+def get_llm_response(prompt, config, stage=STAGE_MAPPING, operation=None):
     """
     Unified handler that dispatches the prompt to the selected AI provider.
 
+    When a run meter is active, the call is checked against the run budget and its
+    usage, latency and retries are recorded.
+
     Args:
         prompt (str): The prompt to send.
         config (dict): Contains 'use_ai', 'ai_provider', and provider-specific keys.
+        stage (str): Pipeline stage used for usage accounting.
+        operation (str): Operation label used for usage accounting (e.g. 'POST /pet').
 
     Returns:
         str: AI-generated response text.
+
+    Raises:
+        BudgetExceededError: If a run-level budget has been used up.
     """
     if not config.get("use_ai", False):
         logging.info("AI usage is disabled. Skipping LLM call.")
         return ""
 
+    meter = get_active_meter()
+    if meter is not None:
+        meter.check_budget()
+
     provider = config.get("ai_provider", "openai").lower()
     logging.info(f"Using AI provider: {provider}")
 
+    # Filled by the provider call; one [api_key, succeeded] entry per attempt
+    usage = {"attempts": []}
+
     if provider == "openai":
         model = config.get("openai", {}).get("model", "gpt-3.5-turbo")
 
         @retry_with_key_rotation("openai", config)
         def call(prompt, api_key=None):
-            return call_openai(prompt, api_key=api_key, model=model)
+            return _metered_attempt(meter, usage, api_key, call_openai,
+                                    prompt, api_key=api_key, model=model, usage=usage)
 
     elif provider == "gemini":
         @retry_with_key_rotation("gemini", config)
         def call(prompt, api_key=None):
-            return call_gemini(prompt, api_key=api_key)
+            return _metered_attempt(meter, usage, api_key, call_gemini, prompt, api_key=api_key, usage=usage)
 
     elif provider == "org_llm":
         @retry_with_key_rotation("org_llm", config)
         def call(prompt, api_key=None):
             # 'api_key' is passed for consistency, although it's read from config inside
-            return call_org_llm(prompt, config)
+            return _metered_attempt(meter, usage, api_key, call_org_llm, prompt, config, usage=usage)
 
     else:
         logging.error(f"Unsupported AI provider: {provider}")
         raise ValueError(f"Unsupported AI provider: {provider}")
 
-    return call(prompt)
+    started = time.perf_counter()
+    try:
+        result = call(prompt)
+    except Exception:
+        if meter is not None:
+            meter.record(stage, operation, usage, prompt, None, time.perf_counter() - started, success=False)
+        raise
+
+    if meter is not None:
+        meter.record(stage, operation, usage, prompt, result, time.perf_counter() - started)
+    return result
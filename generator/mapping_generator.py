@@ -5,7 +5,9 @@ import logging
 from ai_handler import get_llm_response
 from utils.retry import retry_with_key_rotation
 from utils.file_utils import write_json_file
+from utils.metering import BudgetExceededError, STAGE_MAPPING
 from generator.test_case_generator import generate_test_cases
+from generator.template_engine import TemplateEngine
 
 OUTPUT_DIR = "output/mappings"
 
@@ -29,32 +31,84 @@ Only return pure JSON — no comments or extra text.
 """
 
 
-def generate_stub_mapping(endpoint: str, method: str) -> list:
+def generate_stub_mapping(endpoint: str, method: str, operation: dict = None,
+                          template_engine: TemplateEngine = None) -> list:
     """
     Creates a basic fallback mapping with templated dynamic fields.
+
+    When the operation and a template engine are given, the body is synthesized
+    from the operation's first 2xx response schema.
     """
+    status = 200
+    body = json.dumps({
+        "id": "{{randomValue type='UUID'}}",
+        "message": f"Hello {{request.query.name}}, your request to {method.upper()} {endpoint} was successful."
+    })
+
+    if operation and template_engine:
+        synthesized = template_engine.success_body(operation)
+        if synthesized:
+            status, body = synthesized
+
     return [{
         "request": {
             "method": method.upper(),
-            "url": endpoint
+            url_matcher_key(endpoint): endpoint
         },
         "response": {
-            "status": 200,
+            "status": status,
             "headers": {
                 "Content-Type": "application/json"
             },
-            "body": json.dumps({
-                "id": "{{randomValue type='UUID'}}",
-                "message": f"Hello {{request.query.name}}, your request to {method.upper()} {endpoint} was successful."
-            }),
+            "body": body,
             "transformers": ["response-template"]
         }
     }]
 
 
-def apply_response_template_to_mappings(mappings: list) -> list:
+def url_matcher_key(endpoint: str) -> str:
+    """
+    Returns the WireMock request key for an endpoint: `urlPathTemplate` when it has
+    path parameters (so `/pet/{petId}` matches `/pet/1`), otherwise `url`.
+    """
+    return "urlPathTemplate" if "{" in endpoint else "url"
+
+
+def apply_path_templates(mappings: list) -> list:
+    """
+    Rewrites exact `url`/`urlPath` matchers that contain path parameters to
+    `urlPathTemplate`, since WireMock would otherwise only match the literal
+    `{param}` text.
+    """
+    for mapping in mappings:
+        request = mapping.get("request", {})
+        for key in ("url", "urlPath"):
+            url = request.get(key)
+            if isinstance(url, str) and "{" in url and "?" not in url:
+                request[url_matcher_key(url)] = request.pop(key)
+    return mappings
+
+
+def _ensure_json_content_type(response: dict):
+    """Sets a JSON Content-Type, replacing a non-JSON one such as text/plain."""
+    headers = response.setdefault("headers", {})
+    for name in list(headers):
+        if name.lower() == "content-type":
+            if "json" in str(headers[name]).lower():
+                return
+            del headers[name]
+    headers["Content-Type"] = "application/json"
+
+
+def apply_response_template_to_mappings(mappings: list, operation: dict = None,
+                                        template_engine: TemplateEngine = None) -> list:
     """
     Ensures that each mapping has templated body and response-template transformer.
+
+    A `jsonBody` is converted into `body` so the two never coexist. Missing or empty
+    bodies are synthesized from the response schema when one is available; JSON
+    object bodies only get missing sample templated fields. Other bodies (including
+    non-JSON text) are left as they are.
     """
     for mapping in mappings:
         response = mapping.get("response", {})
@@ -63,16 +117,38 @@ def apply_response_template_to_mappings(mappings: list) -> list:
         if "transformers" not in response:
             response["transformers"] = ["response-template"]
 
-        # Convert body to string if it's a dict and inject sample template
         body = response.get("body")
-        if isinstance(body, dict):
-            body.setdefault("id", "{{randomValue type='UUID'}}")
-            body.setdefault("message", "Hello {{request.query.name}}, your request is processed.")
-            response["body"] = json.dumps(body)
-
-        elif isinstance(body, str) and "{{" not in body:
-            # Wrap static body with templating (optional fallback)
-            response["body"] = f'{{"message": "{body} - {{request.method}} call"}}'
+        json_body = response.pop("jsonBody", None)
+        if body in (None, "") and json_body is not None:
+            body = json_body
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+            response["body"] = body
+            _ensure_json_content_type(response)
+
+        # 🧩 Synthesize a schema-driven template only when there is no body
+        if body in (None, ""):
+            template = None
+            if operation and template_engine and "status" in response:
+                template = template_engine.body_for(operation, response["status"])
+            if template is not None:
+                response["body"] = template
+                _ensure_json_content_type(response)
+            continue
+
+        if not isinstance(body, str) or "{{" in body:
+            continue
+
+        # Inject missing sample template fields into JSON object bodies only
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            parsed.setdefault("id", "{{randomValue type='UUID'}}")
+            parsed.setdefault("message", "Hello {{request.query.name}}, your request is processed.")
+            response["body"] = json.dumps(parsed)
+            _ensure_json_content_type(response)
 
     return mappings
 
@@ -94,9 +170,13 @@ def save_mapping_file(endpoint: str, method: str, mappings: list):
         raise
 
 
-def generate_wiremock_mapping(yaml_snippet: str, config: dict, endpoint: str, method: str):
+def generate_wiremock_mapping(yaml_snippet: str, config: dict, endpoint: str, method: str,
+                              operation: dict = None, template_engine: TemplateEngine = None):
     """
     Generates WireMock mappings for a given endpoint + method.
+
+    The optional parsed `operation` and shared `template_engine` enable response
+    bodies synthesized from the spec's schemas.
     """
     use_ai = config.get("use_ai", False)
     provider = config.get("ai_provider", "openai").lower()
@@ -110,15 +190,20 @@ def generate_wiremock_mapping(yaml_snippet: str, config: dict, endpoint: str, me
 
     try:
         if use_ai:
-            prompt = build_prompt(yaml_snippet)
-            logging.info(f"💬 Calling LLM ({provider})...")
-            raw_response = get_llm_response(prompt, config)
-            mappings = json.loads(raw_response)
+            try:
+                prompt = build_prompt(yaml_snippet)
+                logging.info(f"💬 Calling LLM ({provider})...")
+                raw_response = get_llm_response(prompt, config, STAGE_MAPPING, f"{method.upper()} {endpoint}")
+                mappings = json.loads(raw_response)
+            except BudgetExceededError:
+                logging.info(f"💸 Budget exhausted, using stub mapping for {method.upper()} {endpoint}")
+                mappings = generate_stub_mapping(endpoint, method, operation, template_engine)
         else:
-            mappings = generate_stub_mapping(endpoint, method)
+            mappings = generate_stub_mapping(endpoint, method, operation, template_engine)
 
         # ✅ Apply templating consistently
-        mappings = apply_response_template_to_mappings(mappings)
+        mappings = apply_path_templates(mappings)
+        mappings = apply_response_template_to_mappings(mappings, operation, template_engine)
 
         # 💾 Save mappings
         save_mapping_file(endpoint, method, mappings)
@@ -0,0 +1,240 @@
+import json
+
+from utils.schema_utils import MAX_SCHEMA_DEPTH, resolve_ref
+
+INTEGER_TEMPLATE = "{{randomInt lower=1 upper=100000}}"
+NUMBER_TEMPLATE = "{{randomDecimal lower=0 upper=1000}}"
+BOOLEAN_TEMPLATE = "{{pickRandom true false}}"
+
+# randomValue / now templates per OpenAPI string format
+STRING_FORMAT_TEMPLATES = {
+    "uuid": "{{randomValue type='UUID'}}",
+    "date-time": "{{now}}",
+    "date": "{{now format='yyyy-MM-dd'}}",
+    "email": "{{randomValue length=8 type='ALPHABETIC'}}@example.com",
+    "byte": "{{randomValue length=12 type='ALPHANUMERIC'}}",
+    "binary": "{{randomValue length=12 type='HEXADECIMAL'}}",
+}
+STRING_TEMPLATE = "{{randomValue length=10 type='ALPHANUMERIC'}}"
+
+# Value used by jsonPath echoes when the request omits the field
+ECHO_DEFAULTS = {"string": "", "integer": "0", "number": "0", "boolean": "false"}
+
+
+class CompiledTemplate:
+    """
+    A response body template compiled from a schema.
+
+    Fragments are literal strings, or `(name, type, echo, fallback)` tuples for
+    top-level fields that can echo the same field from the request body.
+    """
+    __slots__ = ("fragments", "echo_fields", "static")
+
+    def __init__(self, fragments: list):
+        self.fragments = fragments
+        self.echo_fields = frozenset(f[:2] for f in fragments if isinstance(f, tuple))
+        self.static = "".join(f if isinstance(f, str) else f[3] for f in fragments)
+
+    def render(self, request_fields=frozenset()) -> str:
+        """
+        Renders the body template, echoing every top-level `(name, type)` field
+        that is also in `request_fields`.
+        """
+        if not request_fields or not (self.echo_fields & request_fields):
+            return self.static
+        return "".join(
+            f if isinstance(f, str) else f[2] if f[:2] in request_fields else f[3]
+            for f in self.fragments
+        )
+
+
+def _echo_template(name: str, schema_type: str) -> str:
+    echo = f"{{{{jsonPath request.body '$.{name}' default='{ECHO_DEFAULTS[schema_type]}'}}}}"
+    return f'"{echo}"' if schema_type == "string" else echo
+
+
+class TemplateEngine:
+    """
+    Compiles OpenAPI response schemas into WireMock response-template bodies.
+
+    Compiled templates are cached per `$ref` (or per inline schema), so operations
+    that share components only compile them once per spec.
+    """
+
+    def __init__(self, spec: dict = None):
+        self.spec = spec or {}
+        self._templates = {}
+        self._request_fields = {}
+        self._compiling = set()
+
+    # ------------------------
+    # Schema helpers
+    # ------------------------
+    def _resolve(self, schema):
+        """Follows a local `$ref` and returns the resolved schema."""
+        return resolve_ref(schema, self.spec)[1]
+
+    def _cache_key(self, schema):
+        """Follows a local `$ref` and returns (cache key, resolved schema)."""
+        key, schema = resolve_ref(schema, self.spec)
+        if key is None:
+            key = json.dumps(schema, sort_keys=True, default=str)
+        return key, schema
+
+    def _properties(self, schema) -> dict:
+        """Collects properties of an object schema, merging `allOf` parts."""
+        properties = dict(schema.get("properties", {}))
+        for part in schema.get("allOf", []):
+            properties.update(self._properties(self._resolve(part)))
+        return properties
+
+    def _schema_type(self, schema) -> str:
+        schema = self._resolve(schema)
+        if "type" in schema:
+            return schema["type"]
+        if "properties" in schema or "allOf" in schema:
+            return "object"
+        return "string"
+
+    # ------------------------
+    # Compilation
+    # ------------------------
+    def compile(self, schema) -> CompiledTemplate:
+        """
+        Compiles a schema into a body template, reusing the cached result if present.
+        """
+        key, resolved = self._cache_key(schema)
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+
+        if key in self._compiling:
+            # Recursive schema: stop the cycle with a null value
+            return CompiledTemplate(["null"])
+
+        self._compiling.add(key)
+        try:
+            template = CompiledTemplate(self._compile_fragments(resolved, depth=0))
+        finally:
+            self._compiling.discard(key)
+
+        self._templates[key] = template
+        return template
+
+    def _compile_nested(self, schema, depth: int) -> str:
+        if depth > MAX_SCHEMA_DEPTH:
+            return "null"
+        if isinstance(schema, dict) and "$ref" in schema:
+            return self.compile(schema).static
+        return "".join(
+            f if isinstance(f, str) else f[3]
+            for f in self._compile_fragments(schema, depth)
+        )
+
+    def _compile_fragments(self, schema, depth: int) -> list:
+        schema_type = self._schema_type(schema)
+
+        if schema_type == "object":
+            fragments = ["{"]
+            for i, (name, prop) in enumerate(self._properties(schema).items()):
+                fragments.append(f"{', ' if i else ''}{json.dumps(name)}: ")
+                value = self._compile_nested(prop, depth + 1)
+                prop_type = self._schema_type(prop)
+                if depth == 0 and prop_type in ECHO_DEFAULTS:
+                    fragments.append((name, prop_type, _echo_template(name, prop_type), value))
+                else:
+                    fragments.append(value)
+            fragments.append("}")
+            return fragments
+
+        if schema_type == "array":
+            return ["[", self._compile_nested(schema.get("items", {}), depth + 1), "]"]
+
+        return [self._scalar_template(schema, schema_type)]
+
+    def _scalar_template(self, schema, schema_type: str) -> str:
+        schema = self._resolve(schema)
+        enum = schema.get("enum")
+        if enum:
+            if schema_type == "string":
+                choices = " ".join("'" + str(v).replace("'", "") + "'" for v in enum)
+                return f'"{{{{pickRandom {choices}}}}}"'
+            return f"{{{{pickRandom {' '.join(json.dumps(v) for v in enum)}}}}}"
+        if schema_type == "integer":
+            return INTEGER_TEMPLATE
+        if schema_type == "number":
+            return NUMBER_TEMPLATE
+        if schema_type == "boolean":
+            return BOOLEAN_TEMPLATE
+        return '"' + STRING_FORMAT_TEMPLATES.get(schema.get("format", ""), STRING_TEMPLATE) + '"'
+
+    # ------------------------
+    # Operation helpers
+    # ------------------------
+    def request_fields(self, operation: dict) -> frozenset:
+        """
+        Returns the top-level scalar `(name, type)` fields of an operation's JSON
+        request body, i.e. the fields a response may echo.
+        """
+        schema = _json_schema(operation.get("requestBody", {}).get("content", {}))
+        if schema is None:
+            schema = next((p.get("schema") for p in operation.get("parameters", []) if p.get("in") == "body"), None)
+        if schema is None:
+            return frozenset()
+
+        key, resolved = self._cache_key(schema)
+        fields = self._request_fields.get(key)
+        if fields is None:
+            fields = frozenset(
+                (name, self._schema_type(prop)) for name, prop in self._properties(resolved).items()
+                if self._schema_type(prop) in ECHO_DEFAULTS
+            )
+            self._request_fields[key] = fields
+        return fields
+
+    def body_for(self, operation: dict, status):
+        """
+        Builds the templated response body for an operation's status code.
+
+        Args:
+            operation (dict): Spec operation block.
+            status (int | str): Response status code.
+
+        Returns:
+            str | None: Body template, or None if the spec has no JSON schema for it.
+        """
+        # YAML reads unquoted `200:` keys as ints; compare everything as strings
+        responses = {str(k): v for k, v in (operation.get("responses", {}) or {}).items()}
+        response = responses.get(str(status))
+        if response is None and str(status).startswith("2"):
+            response = responses.get("default")
+        if not response:
+            return None
+
+        response = self._resolve(response)
+        schema = response.get("schema") or _json_schema(response.get("content", {}))
+        if schema is None:
+            return None
+
+        return self.compile(schema).render(self.request_fields(operation))
+
+    def success_body(self, operation: dict):
+        """
+        Returns (status, body template) for the first 2xx response with a JSON schema,
+        or None when the operation defines none.
+        """
+        for status in sorted(str(s) for s in (operation.get("responses", {}) or {})):
+            if status.startswith("2") and status.isdigit():
+                body = self.body_for(operation, status)
+                if body is not None:
+                    return int(status), body
+        return None
+
+
+def _json_schema(content: dict):
+    """Picks the schema of the first JSON media type in an OpenAPI 3.x content map."""
+    for media_type, media in (content or {}).items():
+        if "json" in media_type and isinstance(media, dict):
+            return media.get("schema")
+    return None
+
@@ -3,6 +3,7 @@ import json
 import logging
 import pandas as pd
 from ai_handler import get_llm_response
+from utils.metering import BudgetExceededError, STAGE_TEST_DESCRIPTION
 
 def generate_test_cases(endpoint, method, mappings, config, output_dir):
     """
@@ -53,8 +54,12 @@ Rules:
 
 Only return the test case description.
 """
-                    description = get_llm_response(prompt, config).strip()
+                    description = get_llm_response(
+                        prompt, config, STAGE_TEST_DESCRIPTION, f"{method.upper()} {endpoint}"
+                    ).strip()
                     logging.info(f"🧠 AI description created for {method.upper()} {endpoint} [{status}]")
+                except BudgetExceededError:
+                    description = f"Verify {method.upper()} {endpoint} returns status {status}."
                 except Exception as e:
                     logging.warning(f"⚠️ AI description failed, falling back. Error: {e}")
                     description = f"Verify {method.upper()} {endpoint} returns status {status}."
@@ -2,10 +2,13 @@ import logging
 import yaml
 import os
 
-from utils.file_utils import select_input_file, read_json_file
+from utils.file_utils import select_input_file, read_json_file, write_json_file
 from swagger_parser import load_and_parse_swagger, extract_yaml_for_endpoint
 from generator.mapping_generator import generate_wiremock_mapping
+from generator.template_engine import TemplateEngine
 from generator.test_case_generator import generate_test_cases
+from runner.scenario_runner import run_scenario_suite
+from utils.metering import start_run
 
 
 def load_config():
@@ -90,6 +93,12 @@ def main():
         logging.error(f"❌ {e}")
         return
 
+    # 🧩 Response templates are compiled once per schema and shared across endpoints
+    template_engine = TemplateEngine(parsed_spec)
+
+    # 📈 Meter LLM usage and enforce run budgets from here, after the interactive prompts
+    meter = start_run(config)
+
     # 📦 Step 5: Process selected endpoints for mapping and test generation
     for endpoint in selected_endpoints:
         methods = endpoints.get(endpoint, {})
@@ -102,7 +111,7 @@ def main():
                 yaml_snippet = extract_yaml_for_endpoint(swagger_path, endpoint, method)
 
                 # 💡 Generate WireMock mappings
-                generate_wiremock_mapping(yaml_snippet, config, endpoint, method)
+                generate_wiremock_mapping(yaml_snippet, config, endpoint, method, methods[method], template_engine)
 
                 # 🧪 Optionally generate test cases
                 if config.get("generate_test_cases", False):
@@ -127,6 +136,21 @@ def main():
 
     logging.info("✅ All selected endpoints processed.")
 
+    # 📈 Report LLM usage and throughput for the run
+    report_dir = config.get("report_dir", "output/reports")
+    try:
+        os.makedirs(report_dir, exist_ok=True)
+        write_json_file(os.path.join(report_dir, "run_metrics.json"), meter.log_report())
+    except Exception as e:
+        logging.error(f"❌ Failed to write run metrics: {e}")
+
+    # 🏃 Step 6: Optionally execute contract/load scenarios against the mock target
+    if config.get("run_scenarios", False):
+        try:
+            run_scenario_suite(config, endpoints, parsed_spec)
+        except Exception as e:
+            logging.error(f"❌ Scenario run failed: {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,490 @@
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+from server.mock_server import MappingIndex, RequestContext, TEMPLATE_TOKEN, load_mappings
+from utils.file_utils import write_json_file
+from utils.schema_utils import MAX_SCHEMA_DEPTH, resolve_ref
+
+DEFAULT_TARGET_URL = "http://127.0.0.1:8080"
+DEFAULT_REPORT_DIR = "output/reports"
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+# ========================
+# Sample Request Data
+# ========================
+def sample_value(schema, spec=None, depth=0):
+    """
+    Builds a representative value for a schema, preferring examples and defaults.
+    """
+    _, schema = resolve_ref(schema, spec)
+    if depth > MAX_SCHEMA_DEPTH:
+        return None
+    for key in ("example", "default"):
+        if key in schema:
+            return schema[key]
+    if schema.get("enum"):
+        return schema["enum"][0]
+
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if schema_type == "object":
+        return {
+            name: sample_value(prop, spec, depth + 1)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [sample_value(schema.get("items", {}), spec, depth + 1)]
+    if schema_type == "integer":
+        return 1
+    if schema_type == "number":
+        return 1.0
+    if schema_type == "boolean":
+        return True
+
+    fmt = schema.get("format", "")
+    if fmt == "uuid":
+        return str(uuid.uuid4())
+    if fmt == "date-time":
+        return "2024-01-01T00:00:00Z"
+    if fmt == "date":
+        return "2024-01-01"
+    return "sample"
+
+
+def _request_body_schema(operation):
+    """Returns the JSON request body schema for a Swagger 2.0 or OpenAPI 3.x operation."""
+    content = (operation.get("requestBody") or {}).get("content", {})
+    for media_type, media in content.items():
+        if "json" in media_type:
+            return media.get("schema", {})
+    for param in operation.get("parameters", []):
+        if param.get("in") == "body":
+            return param.get("schema", {})
+    return None
+
+
+def _parameter_schema(param):
+    # Swagger 2.0 keeps type info on the parameter itself
+    return param.get("schema") or {k: v for k, v in param.items() if k in ("type", "format", "enum", "default", "example")}
+
+
+# ========================
+# Scenario Generation
+# ========================
+def _path_regex(path: str):
+    return re.compile("^" + re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(path)) + "$")
+
+
+def find_operation(path: str, method: str, operations: dict):
+    """
+    Finds the spec operation for a mapping path.
+
+    Args:
+        path (str): Mapping URL path (may contain Swagger path parameters).
+        method (str): HTTP method.
+        operations (dict): path -> method -> operation, as returned by load_and_parse_swagger.
+
+    Returns:
+        tuple: (spec path, operation dict) or (None, None).
+    """
+    method = method.lower()
+    if path in operations and method in operations[path]:
+        return path, operations[path][method]
+    for spec_path, methods in operations.items():
+        if method in methods and (_path_regex(spec_path).match(path) or _path_regex(path).match(spec_path)):
+            return spec_path, methods[method]
+    return None, None
+
+
+def _fill_path(path: str, operation: dict, spec: dict) -> str:
+    """Replaces `{param}` segments with sample values from the operation parameters."""
+    params = {p.get("name"): p for p in operation.get("parameters", []) if p.get("in") == "path"}
+
+    def replace(match):
+        param = params.get(match.group(1))
+        value = sample_value(_parameter_schema(param), spec) if param else 1
+        return requests.utils.quote(str(value), safe="")
+
+    return re.sub(r"{([^/]+?)}", replace, path)
+
+
+def _expected_body(body):
+    """Returns (expected body, whether it is a response template)."""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body)
+    body = body or ""
+    return body, bool(TEMPLATE_TOKEN.search(body))
+
+
+def build_scenarios(mappings: list, operations: dict = None, spec: dict = None) -> list:
+    """
+    Turns WireMock mappings and their spec operations into executable scenarios.
+
+    Each scenario carries a concrete request and the status, headers and body the
+    target is expected to return. Exact `url`/`urlPath` mappings are requested
+    literally, as WireMock matches them verbatim; `urlPathTemplate` and regex mappings
+    get sample path parameters from the spec. Mappings that another mapping wins over
+    for the same request, under the local mock server's precedence rules, are marked
+    as skipped.
+
+    Args:
+        mappings (list): WireMock mapping dictionaries.
+        operations (dict): Optional path -> method -> operation from the spec.
+        spec (dict): Optional full parsed spec, used to resolve `$ref` schemas.
+
+    Returns:
+        list: Scenario dictionaries.
+    """
+    operations = operations or {}
+    index = MappingIndex()
+    stubs = [index.add(mapping) for mapping in mappings]
+    scenarios = []
+
+    for i, (mapping, stub) in enumerate(zip(mappings, stubs), start=1):
+        request = mapping.get("request", {})
+        response = mapping.get("response", {})
+        method = stub.method if stub.method != "ANY" else "GET"
+
+        raw_path = stub.path or request.get("urlPathPattern") or request.get("urlPattern") or "/"
+        spec_path, operation = find_operation(raw_path, method, operations)
+        if stub.path is None and spec_path:
+            raw_path = spec_path
+        operation = operation or {}
+
+        # Only templated and regex URLs accept arbitrary parameter values
+        if "url" in request or "urlPath" in request:
+            url = raw_path
+        else:
+            url = _fill_path(raw_path, operation, spec)
+        query = {name: str(m["equalTo"]) for name, m in stub.query_matchers.items() if isinstance(m, dict) and "equalTo" in m}
+        for param in operation.get("parameters", []):
+            if param.get("in") == "query" and param.get("required") and param.get("name") not in query:
+                query[param["name"]] = str(sample_value(_parameter_schema(param), spec))
+        if stub.exact_query is not None:
+            query_string = stub.exact_query
+        else:
+            query_string = "&".join(f"{requests.utils.quote(k)}={requests.utils.quote(v)}" for k, v in query.items())
+        if query_string:
+            url = f"{url}?{query_string}"
+
+        headers = {name: str(m["equalTo"]) for name, m in stub.header_matchers.items() if isinstance(m, dict) and "equalTo" in m}
+
+        body = None
+        for pattern in request.get("bodyPatterns", []) or []:
+            if "equalToJson" in pattern:
+                body = pattern["equalToJson"]
+                break
+        if body is None and method in ("POST", "PUT", "PATCH"):
+            schema = _request_body_schema(operation)
+            if schema is not None:
+                body = sample_value(schema, spec)
+        if body is not None and not isinstance(body, str):
+            body = json.dumps(body)
+            headers.setdefault("content-type", "application/json")
+
+        expected_body, body_is_template = _expected_body(
+            response["jsonBody"] if "jsonBody" in response else response.get("body", "")
+        )
+
+        skip_reason = None
+        served = index.match(RequestContext(method, url, headers, body or ""))
+        if served is None:
+            skip_reason = "No concrete request could be derived that matches this mapping"
+        elif served is not stub:
+            skip_reason = f"Shadowed by mapping #{served.order + 1} ({served.status}) under local matching rules"
+
+        safe_path = raw_path.strip("/").replace("/", "_").replace("{", "").replace("}", "")
+        scenarios.append({
+            "id": f"SC_{method}_{safe_path or 'root'}_{i}",
+            "operation_id": operation.get("operationId"),
+            "method": method,
+            "url": url,
+            "headers": headers,
+            "body": body,
+            "expect": {
+                "status": stub.status,
+                "headers": stub.headers,
+                "body": expected_body,
+                "body_is_template": body_is_template,
+            },
+            "skip_reason": skip_reason,
+        })
+
+    return scenarios
+
+
+# ========================
+# Response Checks
+# ========================
+def _template_regex(template: str):
+    """Turns a response template into a regex where each placeholder matches any text."""
+    parts = TEMPLATE_TOKEN.split(template)
+    # Odd indexes are the placeholder expressions captured by TEMPLATE_TOKEN
+    return re.compile("".join(re.escape(p) if i % 2 == 0 else ".*?" for i, p in enumerate(parts)), re.DOTALL)
+
+
+def _text_matches(expected: str, actual: str) -> bool:
+    if TEMPLATE_TOKEN.search(expected):
+        return _template_regex(expected).fullmatch(actual) is not None
+    return expected == actual
+
+
+def check_response(scenario: dict, status: int, headers, body: str) -> list:
+    """
+    Compares an actual response with a scenario's expectations.
+
+    Returns:
+        list: Human-readable failure messages (empty when the response matches).
+    """
+    expect = scenario["expect"]
+    failures = []
+
+    if status != expect["status"]:
+        failures.append(f"status {status} != {expect['status']}")
+
+    for name, value in expect["headers"].items():
+        actual = headers.get(name)
+        if actual is None:
+            failures.append(f"missing header {name}")
+        elif not _text_matches(str(value), actual):
+            failures.append(f"header {name}: {actual!r} != {value!r}")
+
+    expected_body = expect["body"]
+    if expect["body_is_template"]:
+        if not _template_regex(expected_body).fullmatch(body):
+            failures.append("body does not match response template")
+    elif expected_body:
+        try:
+            if json.loads(expected_body) != json.loads(body):
+                failures.append("JSON body differs")
+        except ValueError:
+            if expected_body != body:
+                failures.append("body differs")
+
+    return failures
+
+
+# ========================
+# Load Generation
+# ========================
+class RateLimiter:
+    """
+    Spaces out request starts to a fixed rate across all worker threads.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._next_slot = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class LatencyHistogram:
+    """
+    Collects request latencies and summarises them as buckets and percentiles.
+    """
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.samples = []
+
+    def record(self, latency_ms: float):
+        self.samples.append(latency_ms)
+        for i, bound in enumerate(self.bounds_ms):
+            if latency_ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> dict:
+        labels = [f"<={b}ms" for b in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        count = len(self.samples)
+        return {
+            "count": count,
+            "min_ms": round(min(self.samples), 3) if count else 0.0,
+            "mean_ms": round(sum(self.samples) / count, 3) if count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(max(self.samples), 3) if count else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def run_scenarios(scenarios: list, target_url: str = DEFAULT_TARGET_URL, concurrency: int = 10,
+                  pool_size: int = None, rate_per_second: float = 0, iterations: int = 1,
+                  timeout: float = 10) -> dict:
+    """
+    Executes scenarios concurrently against a target and checks every response.
+
+    Args:
+        scenarios (list): Scenarios from `build_scenarios`.
+        target_url (str): Base URL of the mock environment (e.g. a local WireMock).
+        concurrency (int): Number of worker threads issuing requests.
+        pool_size (int): HTTP connection pool size (defaults to concurrency).
+        rate_per_second (float): Overall request rate cap; 0 disables throttling.
+        iterations (int): How many times each runnable scenario is executed.
+        timeout (float): Per-request timeout in seconds.
+
+    Returns:
+        dict: Report with pass/fail counts, throughput and latency histogram.
+    """
+    runnable = [s for s in scenarios if not s.get("skip_reason")]
+    skipped = [{"id": s["id"], "reason": s["skip_reason"]} for s in scenarios if s.get("skip_reason")]
+    pool_size = pool_size or concurrency
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    limiter = RateLimiter(rate_per_second)
+    histogram = LatencyHistogram()
+    failures = {}
+    passed = 0
+    errors = 0
+    lock = threading.Lock()
+    base_url = target_url.rstrip("/")
+
+    def execute(scenario):
+        nonlocal passed, errors
+        limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = session.request(
+                scenario["method"], base_url + scenario["url"],
+                headers=scenario["headers"], data=scenario["body"], timeout=timeout,
+            )
+            latency_ms = (time.perf_counter() - started) * 1000
+            problems = check_response(scenario, response.status_code, response.headers, response.text)
+        except requests.RequestException as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            problems = [f"request error: {e}"]
+            with lock:
+                errors += 1
+
+        with lock:
+            histogram.record(latency_ms)
+            if problems:
+                failures.setdefault(scenario["id"], problems)
+            else:
+                passed += 1
+
+    logging.info(f"🏃 Running {len(runnable)} scenario(s) x {iterations} against {base_url} "
+                 f"(concurrency={concurrency}, pool={pool_size}, rate={rate_per_second or 'unlimited'}/s)")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(execute, [s for _ in range(iterations) for s in runnable]))
+    duration = time.perf_counter() - started
+    session.close()
+
+    total = len(runnable) * iterations
+    return {
+        "target_url": base_url,
+        "scenarios": len(scenarios),
+        "skipped": skipped,
+        "requests": total,
+        "passed": passed,
+        "failed": total - passed,
+        "errors": errors,
+        "duration_seconds": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "latency": histogram.summary(),
+        "failures": failures,
+    }
+
+
+def log_report(report: dict):
+    """Logs a human-readable summary of a run report, including the latency histogram."""
+    latency = report["latency"]
+    logging.info(f"📊 {report['passed']}/{report['requests']} request(s) passed, "
+                 f"{len(report['skipped'])} scenario(s) skipped, {report['errors']} transport error(s)")
+    logging.info(f"⏱️ {report['throughput_rps']} req/s | p50 {latency['p50_ms']}ms | "
+                 f"p95 {latency['p95_ms']}ms | p99 {latency['p99_ms']}ms | max {latency['max_ms']}ms")
+
+    peak = max(latency["buckets"].values()) or 1
+    for label, count in latency["buckets"].items():
+        if count:
+            logging.info(f"   {label:>9} | {'#' * max(1, round(40 * count / peak))} {count}")
+
+    for scenario_id, problems in report["failures"].items():
+        logging.warning(f"⚠️ {scenario_id}: {'; '.join(problems)}")
+
+
+def run_scenario_suite(config: dict, operations: dict = None, spec: dict = None) -> dict:
+    """
+    Builds scenarios from the saved mapping files, runs them and writes the reports.
+
+    Args:
+        config (dict): Loaded config.yaml content. Uses 'output_dir', 'report_dir'
+            and the 'scenario_runner' section.
+        operations (dict): Optional path -> method -> operation from the spec.
+        spec (dict): Optional full parsed spec.
+
+    Returns:
+        dict: The run report.
+    """
+    runner_config = config.get("scenario_runner", {}) or {}
+    report_dir = config.get("report_dir", DEFAULT_REPORT_DIR)
+
+    index = load_mappings(config.get("output_dir", "output/mappings"))
+    scenarios = build_scenarios([stub.mapping for stub in index.stubs], operations, spec)
+
+    os.makedirs(report_dir, exist_ok=True)
+    write_json_file(os.path.join(report_dir, "scenarios.json"), scenarios)
+    logging.info(f"🧾 {len(scenarios)} scenario(s) written to {report_dir}")
+
+    report = run_scenarios(
+        scenarios,
+        target_url=runner_config.get("target_url", DEFAULT_TARGET_URL),
+        concurrency=runner_config.get("concurrency", 10),
+        pool_size=runner_config.get("pool_size"),
+        rate_per_second=runner_config.get("rate_per_second", 0),
+        iterations=runner_config.get("iterations", 1),
+        timeout=runner_config.get("timeout_seconds", 10),
+    )
+    log_report(report)
+    write_json_file(os.path.join(report_dir, "scenario_report.json"), report)
+    return report
+
+
+if __name__ == "__main__":
+    from swagger_parser import load_and_parse_swagger
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    with open("config/config.yaml", "r") as f:
+        loaded_config = yaml.safe_load(f)
+
+    spec_file = (loaded_config.get("scenario_runner", {}) or {}).get("spec_file")
+    parsed_spec, endpoints = load_and_parse_swagger(spec_file) if spec_file else (None, None)
+    run_scenario_suite(loaded_config, endpoints, parsed_spec)
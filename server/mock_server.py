@@ -0,0 +1,662 @@
+import os
+import re
+import json
+import uuid
+import random
+import string
+import asyncio
+import logging
+import base64
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import yaml
+
+DEFAULT_MAPPINGS_DIR = "output/mappings"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# WireMock's default stub priority (lower number wins)
+DEFAULT_PRIORITY = 5
+
+TEMPLATE_TOKEN = re.compile(r"{{\s*(.*?)\s*}}")
+HELPER_ARG = re.compile(r"(\w+)=(?:'([^']*)'|\"([^\"]*)\"|(\S+))")
+HELPER_TOKEN = re.compile(r"(\w+=)?(?:'([^']*)'|\"([^\"]*)\"|(\S+))")
+JSON_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+
+# Java date pattern tokens used by WireMock's `now` helper -> strftime
+DATE_FORMAT_TOKENS = [("yyyy", "%Y"), ("MM", "%m"), ("dd", "%d"), ("HH", "%H"), ("mm", "%M"), ("ss", "%S")]
+
+RANDOM_ALPHABETS = {
+    "ALPHANUMERIC": string.ascii_letters + string.digits,
+    "ALPHABETIC": string.ascii_letters,
+    "NUMERIC": string.digits,
+    "HEXADECIMAL": "0123456789abcdef",
+    "ALPHANUMERIC_AND_SYMBOLS": string.ascii_letters + string.digits + string.punctuation,
+}
+
+
+# ========================
+# Request Context
+# ========================
+class RequestContext:
+    """
+    Incoming request as seen by matchers and response templates.
+    """
+    __slots__ = ("method", "url", "path", "query", "headers", "body", "_json_body")
+
+    def __init__(self, method, url, headers=None, body=""):
+        parts = urlsplit(url)
+        self.method = method.upper()
+        self.url = url
+        self.path = unquote(parts.path) or "/"
+        self.query = parse_qs(parts.query, keep_blank_values=True)
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.body = body
+        self._json_body = None
+
+    def json_body(self):
+        """Parses the request body as JSON once per request (None if it is not JSON)."""
+        if self._json_body is None:
+            try:
+                self._json_body = (json.loads(self.body) if self.body else None,)
+            except ValueError:
+                self._json_body = (None,)
+        return self._json_body[0]
+
+
+# ========================
+# Response Templating
+# ========================
+def _parse_helper_args(expression: str) -> dict:
+    """Parses `key='value'` / `key=value` pairs from a Handlebars helper expression."""
+    args = {}
+    for match in HELPER_ARG.finditer(expression):
+        key, single, double, bare = match.groups()
+        args[key] = single if single is not None else double if double is not None else bare
+    return args
+
+
+def _positional_args(expression: str) -> list:
+    """Returns the positional (non key=value) arguments of a helper expression."""
+    values = []
+    for match in list(HELPER_TOKEN.finditer(expression))[1:]:
+        keyword, single, double, bare = match.groups()
+        if not keyword:
+            values.append(single if single is not None else double if double is not None else bare)
+    return values
+
+
+def _random_value_renderer(expression: str):
+    """Builds a renderer for `{{randomValue type='...' length=N}}`."""
+    args = _parse_helper_args(expression)
+    value_type = args.get("type", "ALPHANUMERIC").upper()
+    length = int(args.get("length", 10))
+    uppercase = args.get("uppercase", "false").lower() == "true"
+
+    if value_type == "UUID":
+        return lambda ctx: str(uuid.uuid4())
+
+    alphabet = RANDOM_ALPHABETS.get(value_type, RANDOM_ALPHABETS["ALPHANUMERIC"])
+
+    def render(ctx):
+        value = "".join(random.choices(alphabet, k=length))
+        return value.upper() if uppercase else value
+    return render
+
+
+def _random_number_renderer(expression: str):
+    """Builds a renderer for `{{randomInt ...}}` / `{{randomDecimal ...}}`."""
+    args = _parse_helper_args(expression)
+    if expression.startswith("randomInt"):
+        lower, upper = int(args.get("lower", 0)), int(args.get("upper", 2 ** 31 - 1))
+        return lambda ctx: str(random.randint(lower, upper))
+    lower, upper = float(args.get("lower", 0)), float(args.get("upper", 1))
+    return lambda ctx: repr(random.uniform(lower, upper))
+
+
+def _pick_random_renderer(expression: str):
+    """Builds a renderer for `{{pickRandom 'a' 'b' ...}}`."""
+    choices = _positional_args(expression)
+    if not choices:
+        return None
+    return lambda ctx: random.choice(choices)
+
+
+def _now_renderer(expression: str):
+    """Builds a renderer for `{{now}}` and `{{now format='yyyy-MM-dd'}}`."""
+    java_format = _parse_helper_args(expression).get("format")
+    if java_format is None:
+        return lambda ctx: datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if java_format == "epoch":
+        return lambda ctx: str(int(datetime.now(timezone.utc).timestamp() * 1000))
+    py_format = java_format
+    for token, directive in DATE_FORMAT_TOKENS:
+        py_format = py_format.replace(token, directive)
+    return lambda ctx: datetime.now(timezone.utc).strftime(py_format)
+
+
+def _json_path_renderer(expression: str):
+    """Builds a renderer for `{{jsonPath request.body '$.a.b' default='x'}}`."""
+    positional = _positional_args(expression)
+    if len(positional) != 2 or positional[0] != "request.body" or not positional[1].startswith("$"):
+        return None
+    steps = [name if name else int(idx) for name, idx in JSON_PATH_PART.findall(positional[1])]
+    default = _parse_helper_args(expression).get("default", "")
+
+    def render(ctx):
+        node = ctx.json_body()
+        for step in steps:
+            try:
+                node = node[step]
+            except (KeyError, IndexError, TypeError):
+                return default
+        if node is None:
+            return default
+        return node if isinstance(node, str) else json.dumps(node)
+    return render
+
+
+def _request_attribute_renderer(expression: str):
+    """Builds a renderer for `{{request.*}}` lookups, or returns None if unsupported."""
+    parts = expression.split(".", 2)
+    attribute = parts[1] if len(parts) > 1 else ""
+
+    if attribute == "method" and len(parts) == 2:
+        return lambda ctx: ctx.method
+    if attribute == "url" and len(parts) == 2:
+        return lambda ctx: ctx.url
+    if attribute == "path" and len(parts) == 2:
+        return lambda ctx: ctx.path
+    if attribute == "body" and len(parts) == 2:
+        return lambda ctx: ctx.body
+    if attribute == "query" and len(parts) == 3:
+        name = parts[2]
+        return lambda ctx: (ctx.query.get(name) or [""])[0]
+    if attribute == "headers" and len(parts) == 3:
+        name = parts[2].lower()
+        return lambda ctx: ctx.headers.get(name, "")
+    return None
+
+
+def compile_template(text: str):
+    """
+    Compiles a response-template body once so each request only joins pre-split parts.
+
+    Supported helpers: `randomValue`, `randomInt`, `randomDecimal`, `pickRandom`, `now`,
+    `jsonPath request.body`, `request.method`, `request.url`, `request.path`,
+    `request.body`, `request.query.<name>` and `request.headers.<name>`.
+    Unsupported expressions are left in the output untouched.
+
+    Returns:
+        str | list: The text itself if it has no placeholders, otherwise a list of
+        literal strings and renderer callables.
+    """
+    if "{{" not in text:
+        return text
+
+    parts = []
+    position = 0
+    for match in TEMPLATE_TOKEN.finditer(text):
+        expression = match.group(1)
+        renderer = None
+        helper = expression.split(" ", 1)[0]
+        if helper == "randomValue":
+            renderer = _random_value_renderer(expression)
+        elif helper in ("randomInt", "randomDecimal"):
+            renderer = _random_number_renderer(expression)
+        elif helper == "pickRandom":
+            renderer = _pick_random_renderer(expression)
+        elif helper == "now":
+            renderer = _now_renderer(expression)
+        elif helper == "jsonPath":
+            renderer = _json_path_renderer(expression)
+        elif expression.startswith("request."):
+            renderer = _request_attribute_renderer(expression)
+
+        if renderer is None:
+            continue
+
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        parts.append(renderer)
+        position = match.end()
+
+    if not parts:
+        return text
+    if position < len(text):
+        parts.append(text[position:])
+    return parts
+
+
+def render_template(compiled, ctx: RequestContext) -> str:
+    """Renders a template produced by `compile_template` for the given request."""
+    if isinstance(compiled, str):
+        return compiled
+    return "".join(part if isinstance(part, str) else part(ctx) for part in compiled)
+
+
+# ========================
+# Stub Mappings
+# ========================
+def compile_value_matcher(pattern):
+    """
+    Compiles a WireMock value pattern (`equalTo`, `contains`, `matches`, ...) into a
+    predicate taking the request value (None when absent). Regexes are compiled here,
+    once per mapping, so an invalid pattern fails at load time.
+    """
+    if not isinstance(pattern, dict):
+        expected = str(pattern)
+        return lambda value: value == expected
+    if "absent" in pattern:
+        absent = bool(pattern["absent"])
+        return lambda value: (value is None) == absent
+    if "equalTo" in pattern:
+        expected = str(pattern["equalTo"])
+        if pattern.get("caseInsensitive"):
+            expected = expected.lower()
+            return lambda value: value is not None and value.lower() == expected
+        return lambda value: value == expected
+    if "contains" in pattern:
+        expected = str(pattern["contains"])
+        return lambda value: value is not None and expected in value
+    if "matches" in pattern:
+        regex = re.compile(pattern["matches"])
+        return lambda value: value is not None and regex.fullmatch(value) is not None
+    if "doesNotMatch" in pattern:
+        regex = re.compile(pattern["doesNotMatch"])
+        return lambda value: value is not None and regex.fullmatch(value) is None
+    # Unknown matcher types are treated as satisfied rather than hiding the stub
+    return lambda value: value is not None
+
+
+class StubMapping:
+    """
+    A single WireMock mapping with its response pre-compiled for serving.
+    """
+
+    def __init__(self, mapping: dict, order: int, source: str = ""):
+        request = mapping.get("request", {})
+        response = mapping.get("response", {})
+
+        self.mapping = mapping
+        self.order = order
+        self.source = source
+        self.priority = mapping.get("priority", DEFAULT_PRIORITY)
+        self.method = str(request.get("method", "ANY")).upper()
+
+        self.query_matchers = request.get("queryParameters", {}) or {}
+        self.header_matchers = {k.lower(): v for k, v in (request.get("headers", {}) or {}).items()}
+        self._query_predicates = [(k, compile_value_matcher(v)) for k, v in self.query_matchers.items()]
+        self._header_predicates = [(k, compile_value_matcher(v)) for k, v in self.header_matchers.items()]
+
+        # URL matching: exact `url` (path + query), `urlPath`, `urlPathTemplate`, or a regex variant
+        self.exact_query = None
+        self.url_regex = None
+        self.match_path_only = True
+        # Only urlPathTemplate treats `{param}` segments as wildcards; url/urlPath are literal
+        self.path_template = "urlPathTemplate" in request
+        if "url" in request:
+            parts = urlsplit(request["url"])
+            self.path = parts.path or "/"
+            self.exact_query = parts.query
+        elif "urlPath" in request:
+            self.path = request["urlPath"]
+        elif "urlPathTemplate" in request:
+            self.path = request["urlPathTemplate"]
+        elif "urlPattern" in request:
+            self.path = None
+            self.url_regex = re.compile(request["urlPattern"])
+            self.match_path_only = False
+        elif "urlPathPattern" in request:
+            self.path = None
+            self.url_regex = re.compile(request["urlPathPattern"])
+        else:
+            # No URL matcher means "any URL" in WireMock
+            self.path = None
+            self.url_regex = re.compile(".*")
+
+        self.status = int(response.get("status", 200))
+        self.headers = dict(response.get("headers", {}) or {})
+        self.delay_ms = response.get("fixedDelayMilliseconds", 0) or 0
+
+        if "jsonBody" in response:
+            body = json.dumps(response["jsonBody"])
+        elif "base64Body" in response:
+            body = base64.b64decode(response["base64Body"]).decode("utf-8", errors="replace")
+        else:
+            body = response.get("body", "")
+            if not isinstance(body, str):
+                body = json.dumps(body)
+
+        templated = "response-template" in (response.get("transformers") or [])
+        self.body = compile_template(body) if templated else body
+
+    def matches_extras(self, ctx: RequestContext) -> bool:
+        """Checks the matchers that are not covered by the method/URL index."""
+        if self.url_regex is not None:
+            target = ctx.url if not self.match_path_only else ctx.path
+            if not self.url_regex.fullmatch(target):
+                return False
+        if self.exact_query is not None and urlsplit(ctx.url).query != self.exact_query:
+            return False
+        for name, predicate in self._query_predicates:
+            values = ctx.query.get(name)
+            if not predicate(values[0] if values else None):
+                return False
+        for name, predicate in self._header_predicates:
+            if not predicate(ctx.headers.get(name)):
+                return False
+        return True
+
+    def render(self, ctx: RequestContext):
+        """Returns (status, headers, body bytes) for the given request."""
+        body = render_template(self.body, ctx).encode("utf-8")
+        return self.status, self.headers, body
+
+
+class _TrieNode:
+    __slots__ = ("children", "wildcard", "stubs")
+
+    def __init__(self):
+        self.children = {}
+        self.wildcard = None
+        self.stubs = []
+
+
+def _is_path_parameter(segment: str) -> bool:
+    return segment.startswith("{") and segment.endswith("}")
+
+
+class MappingIndex:
+    """
+    Indexes stub mappings by HTTP method and a per-method URL segment trie.
+
+    Path parameters (`/pet/{petId}`) in `urlPathTemplate` mappings are treated as
+    single-segment wildcards; in `url`/`urlPath` mappings they are literal text, as
+    in WireMock. Regex-based URL matchers are kept in a small per-method list and
+    checked after the trie lookup.
+
+    Matching follows this server's own precedence rather than WireMock's: the most
+    specific path wins (literal segments beat parameters, left to right), then the
+    lowest priority value, then the most recently added mapping.
+    """
+
+    def __init__(self):
+        self._tries = {}
+        self._patterns = {}
+        self.stubs = []
+
+    def add(self, mapping: dict, source: str = ""):
+        stub = StubMapping(mapping, order=len(self.stubs), source=source)
+        self.stubs.append(stub)
+
+        if stub.path is None:
+            self._patterns.setdefault(stub.method, []).append(stub)
+            return stub
+
+        node = self._tries.setdefault(stub.method, _TrieNode())
+        for segment in stub.path.strip("/").split("/"):
+            if stub.path_template and _is_path_parameter(segment):
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.stubs.append(stub)
+        return stub
+
+    def _walk(self, node, segments, index, specificity, found):
+        """Collects (specificity, stub) pairs; specificity flags literal segments with 1."""
+        if index == len(segments):
+            found.extend((specificity, stub) for stub in node.stubs)
+            return
+        child = node.children.get(segments[index])
+        if child is not None:
+            self._walk(child, segments, index + 1, specificity + (1,), found)
+        if node.wildcard is not None:
+            self._walk(node.wildcard, segments, index + 1, specificity + (0,), found)
+
+    def match(self, ctx: RequestContext):
+        """
+        Finds the stub to serve: most specific path first, then lowest priority
+        value, then the most recently added mapping.
+        """
+        candidates = []
+        segments = ctx.path.strip("/").split("/")
+        for method in (ctx.method, "ANY"):
+            trie = self._tries.get(method)
+            if trie is not None:
+                self._walk(trie, segments, 0, (), candidates)
+            # Regex matchers rank below any trie match
+            candidates.extend(((-1,), stub) for stub in self._patterns.get(method, ()))
+
+        best, best_rank = None, None
+        for specificity, stub in candidates:
+            if not stub.matches_extras(ctx):
+                continue
+            rank = (specificity, -stub.priority, stub.order)
+            if best is None or rank > best_rank:
+                best, best_rank = stub, rank
+        return best
+
+    def __len__(self):
+        return len(self.stubs)
+
+
+def load_mappings(mappings_dir: str = DEFAULT_MAPPINGS_DIR) -> MappingIndex:
+    """
+    Loads every mapping file written by `save_mapping_file` into a `MappingIndex`.
+
+    Files may hold a list of mappings, a single mapping, or WireMock's
+    `{"mappings": [...]}` export format.
+    """
+    index = MappingIndex()
+    if not os.path.isdir(mappings_dir):
+        logging.warning(f"⚠️ Mappings directory not found: {mappings_dir}")
+        return index
+
+    for file_name in sorted(os.listdir(mappings_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        file_path = os.path.join(mappings_dir, file_name)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error(f"❌ Skipping unreadable mapping file {file_path}: {e}")
+            continue
+
+        if isinstance(data, dict):
+            data = data.get("mappings", [data])
+        for mapping in data:
+            try:
+                index.add(mapping, source=file_name)
+            except Exception as e:
+                logging.error(f"❌ Skipping invalid mapping in {file_name}: {e}")
+
+    logging.info(f"📚 Loaded {len(index)} stub mapping(s) from {mappings_dir}")
+    return index
+
+
+# ========================
+# HTTP Server
+# ========================
+NOT_FOUND_BODY = b"No stub mapping matched the request."
+TEXT_HEADERS = {"Content-Type": "text/plain"}
+
+
+class BadRequestError(ValueError):
+    """Raised when an incoming request cannot be parsed."""
+
+
+async def _read_body(reader, headers: dict) -> bytes:
+    """Reads a request body framed by Content-Length or chunked transfer encoding."""
+    encoding = headers.get("transfer-encoding", "").lower()
+    if encoding:
+        if encoding != "chunked":
+            raise BadRequestError(f"Unsupported Transfer-Encoding: {encoding}")
+        chunks = []
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise BadRequestError("Malformed chunk size")
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            if await reader.readexactly(2) != b"\r\n":
+                raise BadRequestError("Malformed chunk terminator")
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise BadRequestError("Malformed Content-Length")
+    if length < 0:
+        raise BadRequestError("Malformed Content-Length")
+    return await reader.readexactly(length) if length else b""
+
+
+class MockServer:
+    """
+    Minimal asyncio HTTP/1.1 server that answers requests from a `MappingIndex`.
+    """
+
+    def __init__(self, index: MappingIndex, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.index = index
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def respond(self, ctx: RequestContext):
+        """Returns (status, headers, body bytes, delay ms) for a request."""
+        stub = self.index.match(ctx)
+        if stub is None:
+            logging.debug(f"No stub matched {ctx.method} {ctx.url}")
+            return 404, {"Content-Type": "text/plain"}, NOT_FOUND_BODY, 0
+        status, headers, body = stub.render(ctx)
+        return status, headers, body, stub.delay_ms
+
+    @staticmethod
+    async def _write_response(writer, status: int, headers: dict, payload: bytes, keep_alive: bool,
+                              send_body: bool = True):
+        """Writes a response; HEAD responses keep Content-Length but omit the body."""
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        for name, value in headers.items():
+            if name.lower() not in ("content-length", "connection", "transfer-encoding"):
+                lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(payload)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (payload if send_body else b""))
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_response(writer, 431, TEXT_HEADERS, b"Request header too large", False)
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._write_response(writer, 400, TEXT_HEADERS, b"Malformed request line", False)
+                    break
+
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    body = await _read_body(reader, headers)
+                except BadRequestError as e:
+                    # The stream position is unknown after a framing error, so close it
+                    await self._write_response(writer, 400, TEXT_HEADERS, str(e).encode("utf-8"), False)
+                    break
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    ctx = RequestContext(method, target, headers, body.decode("utf-8", errors="replace"))
+                    status, response_headers, payload, delay_ms = self.respond(ctx)
+                except Exception as e:
+                    logging.exception(f"❌ Failed to serve {method} {target}")
+                    status, response_headers, payload, delay_ms = 500, TEXT_HEADERS, str(e).encode("utf-8"), 0
+
+                if delay_ms:
+                    await asyncio.sleep(delay_ms / 1000)
+                await self._write_response(writer, status, response_headers, payload, keep_alive,
+                                           send_body=method.upper() != "HEAD")
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Starts listening; returns once the socket is bound."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Reflect the real port when an ephemeral port (0) was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"🚀 Mock server listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+def run_mock_server(config: dict):
+    """
+    Loads the generated mappings and serves them until interrupted.
+
+    Args:
+        config (dict): Loaded config.yaml content. Uses 'output_dir' and the
+            optional 'mock_server' section (host, port).
+    """
+    server_config = config.get("mock_server", {}) or {}
+    index = load_mappings(config.get("output_dir", DEFAULT_MAPPINGS_DIR))
+    server = MockServer(
+        index,
+        host=server_config.get("host", DEFAULT_HOST),
+        port=server_config.get("port", DEFAULT_PORT),
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logging.info("🛑 Mock server stopped.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    with open("config/config.yaml", "r") as f:
+        run_mock_server(yaml.safe_load(f))
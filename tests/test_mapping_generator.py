@@ -0,0 +1,63 @@
+import json
+
+from generator.mapping_generator import apply_path_templates, apply_response_template_to_mappings, generate_stub_mapping
+from generator.template_engine import TemplateEngine
+
+OPERATION = {
+    "responses": {
+        "200": {"content": {"application/json": {"schema": {
+            "type": "object", "properties": {"name": {"type": "string"}},
+        }}}},
+    },
+}
+
+
+def test_parameterised_url_becomes_path_template():
+    mappings = apply_path_templates([
+        {"request": {"method": "GET", "url": "/pet/{petId}"}},
+        {"request": {"method": "GET", "url": "/pet/findByStatus"}},
+        {"request": {"method": "GET", "url": "/pet/{petId}?full=true"}},
+        {"request": {"method": "DELETE", "urlPath": "/pet/{petId}"}},
+        {"request": {"method": "GET", "urlPath": "/store/inventory"}},
+    ])
+
+    assert mappings[0]["request"] == {"method": "GET", "urlPathTemplate": "/pet/{petId}"}
+    assert mappings[1]["request"] == {"method": "GET", "url": "/pet/findByStatus"}
+    assert "url" in mappings[2]["request"]
+    assert mappings[3]["request"] == {"method": "DELETE", "urlPathTemplate": "/pet/{petId}"}
+    assert mappings[4]["request"] == {"method": "GET", "urlPath": "/store/inventory"}
+
+
+def test_stub_mapping_uses_path_template_for_parameters():
+    assert generate_stub_mapping("/pet/{petId}", "get")[0]["request"]["urlPathTemplate"] == "/pet/{petId}"
+    assert generate_stub_mapping("/pet", "post")[0]["request"]["url"] == "/pet"
+
+
+def _respond(response):
+    mapping = {"request": {"method": "GET", "urlPath": "/pet"}, "response": response}
+    return apply_response_template_to_mappings([mapping], OPERATION, TemplateEngine())[0]["response"]
+
+
+def test_empty_body_is_synthesized_as_json():
+    response = _respond({"status": 200, "body": "", "headers": {"content-type": "text/plain"}})
+
+    assert "randomValue" in response["body"]
+    assert response["headers"] == {"Content-Type": "application/json"}
+
+
+def test_existing_bodies_are_kept():
+    json_response = _respond({"status": 200, "body": '{"name": "Rex"}'})
+    text_response = _respond({"status": 200, "body": "pong", "headers": {"Content-Type": "text/plain"}})
+
+    assert json.loads(json_response["body"])["name"] == "Rex"
+    assert "id" in json.loads(json_response["body"])
+    assert text_response["body"] == "pong"
+    assert text_response["headers"] == {"Content-Type": "text/plain"}
+
+
+def test_json_body_is_converted_to_body():
+    response = _respond({"status": 200, "jsonBody": {"name": "Rex"}})
+
+    assert "jsonBody" not in response
+    assert json.loads(response["body"])["name"] == "Rex"
+    assert response["headers"]["Content-Type"] == "application/json"
@@ -0,0 +1,127 @@
+import pytest
+
+import ai_handler
+import utils.metering as metering
+import utils.retry as retry
+from utils.metering import BudgetExceededError, RunMeter
+
+CONFIG = {"use_ai": True, "ai_provider": "openai", "retry_attempts": 3, "retry_delay_seconds": 0}
+
+
+def _usage(*attempts, **tokens):
+    return {"attempts": [[key, ok, 0.1] for key, ok in attempts], **tokens}
+
+
+# ========================
+# RunMeter.check_budget
+# ========================
+def test_unlimited_budget_never_raises():
+    meter = RunMeter()
+    meter.record("mapping", "GET /pet", _usage(("sk-aaaa", True), prompt_tokens=10**6, completion_tokens=1), "p", "r", 0.1)
+    meter.check_budget()
+
+
+def test_token_budget_is_sticky():
+    meter = RunMeter(max_tokens=100)
+    meter.check_budget()
+    meter.record("mapping", "GET /pet", _usage(("sk-aaaa", True), prompt_tokens=80, completion_tokens=20), "p", "r", 0.1)
+
+    with pytest.raises(BudgetExceededError, match="token budget"):
+        meter.check_budget()
+    assert meter.exhausted_reason == "token budget of 100 reached"
+
+
+def test_request_budget_counts_each_attempt():
+    meter = RunMeter(max_requests=2)
+    meter.begin_attempt()
+    meter.begin_attempt()
+
+    with pytest.raises(BudgetExceededError, match="request budget"):
+        meter.begin_attempt()
+    assert meter.requests_started == 2
+
+
+def test_wall_time_budget(monkeypatch):
+    meter = RunMeter(max_wall_seconds=5)
+    monkeypatch.setattr(meter, "elapsed", lambda: 6)
+
+    with pytest.raises(BudgetExceededError, match="wall-time budget"):
+        meter.check_budget()
+
+
+# ========================
+# RunMeter.record
+# ========================
+def test_failed_calls_are_not_estimated():
+    meter = RunMeter(max_tokens=1)
+    meter.record("mapping", "GET /pet", _usage(("sk-aaaa", False)), "a long prompt " * 50, None, 0.1, success=False)
+
+    totals = meter.report()["totals"]
+    assert (totals["failed_calls"], totals["attempts"], totals["total_tokens"]) == (1, 1, 0)
+    meter.check_budget()
+
+
+def test_missing_usage_is_estimated_for_successful_calls():
+    meter = RunMeter()
+    meter.record("mapping", "GET /pet", _usage(("sk-aaaa", True)), "x" * 40, "y" * 8, 0.1)
+
+    totals = meter.report()["totals"]
+    assert (totals["prompt_tokens"], totals["completion_tokens"], totals["estimated_calls"]) == (10, 2, 1)
+
+
+def test_attempts_are_credited_per_key():
+    meter = RunMeter()
+    usage = _usage(("sk-aaaa", False), ("sk-bbbb", False), ("sk-aaaa", True), prompt_tokens=5, completion_tokens=5)
+    usage["attempts"][2][2] = 0.5
+    meter.record("mapping", "GET /pet", usage, "p", "r", 0.7)
+
+    by_key = meter.report()["by_key"]
+    assert by_key["...aaaa"]["attempts"] == 2 and by_key["...aaaa"]["failed_attempts"] == 1
+    assert by_key["...aaaa"]["calls"] == 1 and by_key["...aaaa"]["total_tokens"] == 10
+    assert by_key["...bbbb"] == dict(by_key["...bbbb"], attempts=1, failed_attempts=1, calls=0, total_tokens=0)
+    assert by_key["...aaaa"]["latency_seconds"] == 0.6 and by_key["...bbbb"]["latency_seconds"] == 0.1
+
+
+# ========================
+# get_llm_response metering
+# ========================
+@pytest.fixture
+def fake_openai(monkeypatch):
+    keys = iter(["sk-aaaa", "sk-bbbb", "sk-cccc", "sk-dddd"])
+    monkeypatch.setattr(retry, "load_api_keys", lambda provider: ["sk-key"])
+    monkeypatch.setattr(retry.random, "choice", lambda options: next(keys))
+    outcomes = []
+
+    def call_openai(prompt, api_key, model="x", usage=None):
+        if outcomes.pop(0):
+            usage.update(prompt_tokens=3, completion_tokens=4)
+            return "ok"
+        raise RuntimeError("429")
+
+    monkeypatch.setattr(ai_handler, "call_openai", call_openai)
+    yield outcomes
+    monkeypatch.setattr(metering, "_active_meter", None)
+
+
+def test_retries_are_recorded_per_key(fake_openai):
+    fake_openai.extend([False, True])
+    meter = metering.start_run(CONFIG)
+
+    assert ai_handler.get_llm_response("hi", CONFIG, operation="GET /pet") == "ok"
+    report = meter.report()
+    assert report["totals"]["attempts"] == 2 and report["totals"]["total_tokens"] == 7
+    assert report["by_key"]["...aaaa"]["failed_attempts"] == 1
+    assert report["by_key"]["...bbbb"]["calls"] == 1
+    key_latency = sum(stats["latency_seconds"] for stats in report["by_key"].values())
+    assert key_latency <= report["totals"]["latency_seconds"] + 0.001
+
+
+def test_request_budget_stops_retries(fake_openai):
+    fake_openai.extend([False, False, False])
+    meter = metering.start_run(dict(CONFIG, budget={"max_requests": 2}))
+
+    with pytest.raises(BudgetExceededError):
+        ai_handler.get_llm_response("hi", CONFIG)
+    assert meter.requests_started == 2
+    assert fake_openai == [False]
+    assert meter.report()["totals"]["failed_calls"] == 1
@@ -0,0 +1,206 @@
+import re
+import json
+import asyncio
+
+import pytest
+
+from server.mock_server import MappingIndex, MockServer, RequestContext, compile_template, render_template
+
+
+def _mapping(url_key, url, status, priority=None):
+    mapping = {"request": {"method": "GET", url_key: url}, "response": {"status": status}}
+    if priority is not None:
+        mapping["priority"] = priority
+    return mapping
+
+
+def _match(index, url, method="GET"):
+    stub = index.match(RequestContext(method, url))
+    return stub.status if stub else None
+
+
+# ========================
+# MappingIndex.match
+# ========================
+def test_literal_path_beats_later_path_parameter():
+    index = MappingIndex()
+    index.add(_mapping("url", "/pet/findByStatus", 201))
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 200))
+
+    assert _match(index, "/pet/findByStatus") == 201
+    assert _match(index, "/pet/7") == 200
+
+
+def test_leftmost_literal_segment_wins():
+    index = MappingIndex()
+    index.add(_mapping("urlPathTemplate", "/users/me/{section}", 201))
+    index.add(_mapping("urlPathTemplate", "/users/{id}/orders", 200))
+
+    assert _match(index, "/users/me/orders") == 201
+
+
+@pytest.mark.parametrize("url_key", ["url", "urlPath"])
+def test_exact_matchers_treat_parameters_literally(url_key):
+    index = MappingIndex()
+    index.add(_mapping(url_key, "/pet/{petId}", 200))
+
+    assert _match(index, "/pet/7") is None
+    assert _match(index, "/pet/{petId}") == 200
+    assert _match(index, "/pet/%7BpetId%7D") == 200
+
+
+def test_trie_match_beats_regex():
+    index = MappingIndex()
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 200))
+    index.add(_mapping("urlPathPattern", "/pet/.*", 500, priority=1))
+
+    assert _match(index, "/pet/7") == 200
+
+
+def test_priority_then_most_recent_on_equal_paths():
+    index = MappingIndex()
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 200, priority=1))
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 404))
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 400))
+
+    assert _match(index, "/pet/1") == 200
+
+    index = MappingIndex()
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 404))
+    index.add(_mapping("urlPathTemplate", "/pet/{petId}", 400))
+    assert _match(index, "/pet/1") == 400
+
+
+def test_url_requires_exact_query_and_any_method_matches():
+    index = MappingIndex()
+    index.add({"request": {"method": "ANY", "url": "/login?user=a"}, "response": {"status": 200}})
+
+    assert _match(index, "/login?user=a", method="POST") == 200
+    assert _match(index, "/login?user=b") is None
+
+
+def test_query_matchers_are_precompiled():
+    index = MappingIndex()
+    index.add({
+        "request": {"method": "GET", "urlPath": "/pets", "queryParameters": {"status": {"matches": "sold|pending"}}},
+        "response": {"status": 200},
+    })
+
+    assert _match(index, "/pets?status=sold") == 200
+    assert _match(index, "/pets?status=new") is None
+    assert _match(index, "/pets") is None
+
+    with pytest.raises(re.error):
+        index.add({"request": {"urlPath": "/x", "queryParameters": {"q": {"matches": "("}}}, "response": {}})
+
+
+# ========================
+# compile_template
+# ========================
+def _render(template, body="", url="/pet?name=Rex", method="POST"):
+    return render_template(compile_template(template), RequestContext(method, url, {"X-Trace": "t1"}, body))
+
+
+def test_plain_text_is_not_compiled():
+    assert compile_template("static") == "static"
+
+
+def test_request_helpers():
+    assert _render("{{request.method}} {{request.path}} {{request.query.name}} {{request.headers.X-Trace}}") == "POST /pet Rex t1"
+    assert _render("[{{request.query.missing}}]") == "[]"
+
+
+def test_random_helpers():
+    assert re.fullmatch(r"[0-9a-f-]{36}", _render("{{randomValue type='UUID'}}"))
+    assert re.fullmatch(r"[0-9]{6}", _render("{{randomValue length=6 type='NUMERIC'}}"))
+    assert 3 <= int(_render("{{randomInt lower=3 upper=5}}")) <= 5
+    assert _render("{{pickRandom 'a' 'b'}}") in ("a", "b")
+
+
+def test_now_helper_formats():
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", _render("{{now}}"))
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}", _render("{{now format='yyyy-MM-dd'}}"))
+
+
+def test_json_path_helper():
+    body = json.dumps({"name": "Rex", "tags": [{"id": 3}]})
+    assert _render("{{jsonPath request.body '$.name'}}", body) == "Rex"
+    assert _render("{{jsonPath request.body '$.tags[0].id'}}", body) == "3"
+    assert _render("{{jsonPath request.body '$.missing' default='0'}}", body) == "0"
+    assert _render("{{jsonPath request.body '$.name' default='x'}}", "not json") == "x"
+
+
+def test_unknown_helpers_are_left_untouched():
+    assert _render("{{#if x}}y{{/if}} {{request.method}}") == "{{#if x}}y{{/if}} POST"
+
+
+# ========================
+# MockServer connection handling
+# ========================
+def _exchange(index, raw_request: bytes) -> bytes:
+    async def run():
+        server = MockServer(index, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(raw_request)
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return data
+        finally:
+            await server.stop()
+    return asyncio.run(run())
+
+
+def _echo_index():
+    index = MappingIndex()
+    index.add({
+        "request": {"method": "POST", "urlPath": "/echo"},
+        "response": {"status": 200, "body": "{{request.body}}", "transformers": ["response-template"]},
+    })
+    return index
+
+
+def test_content_length_body_is_served():
+    data = _exchange(_echo_index(), b"POST /echo HTTP/1.1\r\nContent-Length: 5\r\nConnection: close\r\n\r\nhello")
+    assert data.startswith(b"HTTP/1.1 200 OK") and data.endswith(b"\r\n\r\nhello")
+
+
+def test_chunked_body_is_decoded():
+    request = (b"POST /echo HTTP/1.1\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+               b"3\r\nhel\r\n2;ext=1\r\nlo\r\n0\r\n\r\n")
+    data = _exchange(_echo_index(), request)
+    assert data.startswith(b"HTTP/1.1 200 OK") and data.endswith(b"\r\n\r\nhello")
+
+
+@pytest.mark.parametrize("request_bytes", [
+    b"POST /echo HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+    b"POST /echo HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+    b"POST /echo HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n",
+    b"garbage\r\n\r\n",
+])
+def test_malformed_requests_get_400(request_bytes):
+    assert _exchange(_echo_index(), request_bytes).startswith(b"HTTP/1.1 400")
+
+
+def test_render_failure_returns_500():
+    index = MappingIndex()
+    stub = index.add({"request": {"method": "GET", "urlPath": "/boom"}, "response": {"status": 200}})
+
+    def explode(ctx):
+        raise RuntimeError("render failed")
+    stub.render = explode
+
+    data = _exchange(index, b"GET /boom HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert data.startswith(b"HTTP/1.1 500")
+
+
+def test_head_response_has_no_body_and_keeps_connection_in_sync():
+    index = MappingIndex()
+    index.add({"request": {"method": "ANY", "urlPath": "/pet"}, "response": {"status": 200, "body": "hello"}})
+
+    data = _exchange(index, b"HEAD /pet HTTP/1.1\r\n\r\nGET /pet HTTP/1.1\r\nConnection: close\r\n\r\n")
+    head, get = data.split(b"HTTP/1.1 200 OK")[1:]
+    assert b"Content-Length: 5" in head and head.endswith(b"\r\n\r\n")
+    assert get.endswith(b"\r\n\r\nhello")
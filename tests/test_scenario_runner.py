@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+from runner.scenario_runner import build_scenarios, check_response, run_scenarios
+from server.mock_server import MappingIndex, MockServer
+from swagger_parser import load_and_parse_swagger
+
+
+def _mapping(url_key, url, status=200, method="GET", body=""):
+    return {
+        "request": {"method": method, url_key: url},
+        "response": {"status": status, "body": body, "transformers": ["response-template"]},
+    }
+
+
+def test_exact_url_is_requested_literally():
+    scenarios = build_scenarios([_mapping("url", "/pet/{petId}")])
+    assert scenarios[0]["url"] == "/pet/{petId}"
+
+
+def test_path_template_gets_sample_parameters_from_spec():
+    spec, operations = load_and_parse_swagger("input/openapi.yaml")
+    scenarios = build_scenarios([_mapping("urlPathTemplate", "/pet/{petId}")], operations, spec)
+
+    assert scenarios[0]["url"] == "/pet/1"
+    assert scenarios[0]["operation_id"] == "getPetById"
+    assert scenarios[0]["skip_reason"] is None
+
+
+def test_literal_endpoints_are_not_shadowed_by_path_templates():
+    mappings = [
+        _mapping("url", "/pet/findByStatus", 201),
+        _mapping("urlPathTemplate", "/pet/{petId}", 200),
+        _mapping("url", "/user/login", 202),
+        _mapping("urlPathTemplate", "/user/{username}", 200),
+    ]
+    scenarios = build_scenarios(mappings)
+    assert [s["skip_reason"] for s in scenarios] == [None] * 4
+
+
+def test_mapping_hidden_by_later_mapping_is_skipped():
+    scenarios = build_scenarios([_mapping("url", "/pet", 404), _mapping("url", "/pet", 200)])
+
+    assert "Shadowed by mapping #2" in scenarios[0]["skip_reason"]
+    assert scenarios[1]["skip_reason"] is None
+
+
+def test_check_response_matches_template_placeholders():
+    scenario = build_scenarios([_mapping("url", "/pet", body='{"id": "{{randomValue type=\'UUID\'}}"}')])[0]
+
+    assert check_response(scenario, 200, {}, '{"id": "abc-123"}') == []
+    assert check_response(scenario, 200, {}, '{"other": 1}') == ["body does not match response template"]
+    assert check_response(scenario, 500, {}, '{"id": "x"}') == ["status 500 != 200"]
+
+
+def test_run_scenarios_against_local_mock_server():
+    mappings = [
+        _mapping("urlPathTemplate", "/pet/{petId}", body='{"id": {{randomInt lower=1 upper=9}}}'),
+        _mapping("url", "/pet/findByStatus?status=sold", 201, body="sold"),
+    ]
+    index = MappingIndex()
+    for mapping in mappings:
+        index.add(mapping)
+
+    loop = asyncio.new_event_loop()
+    server = MockServer(index, port=0)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        report = run_scenarios(build_scenarios(mappings), f"http://{server.host}:{server.port}",
+                               concurrency=4, iterations=5)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    assert report["requests"] == 10
+    assert report["passed"] == 10, report["failures"]
+    assert report["latency"]["count"] == 10
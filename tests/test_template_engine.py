@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from generator.template_engine import TemplateEngine
+from server.mock_server import RequestContext, compile_template, render_template
+from swagger_parser import load_and_parse_swagger
+from utils.schema_utils import resolve_ref
+
+SPECS = ["input/openapi.yaml", "input/swagger.yaml"]
+
+
+def _render(body_template, request_body=None):
+    ctx = RequestContext("POST", "/", {}, json.dumps(request_body) if request_body is not None else "")
+    return json.loads(render_template(compile_template(body_template), ctx))
+
+
+@pytest.mark.parametrize("spec_file", SPECS)
+def test_every_response_schema_renders_valid_json(spec_file):
+    spec, operations = load_and_parse_swagger(spec_file)
+    engine = TemplateEngine(spec)
+
+    rendered = 0
+    for methods in operations.values():
+        for operation in methods.values():
+            for status in operation.get("responses", {}):
+                body = engine.body_for(operation, status)
+                if body is not None:
+                    _render(body, {"name": "Rex", "id": 7})
+                    rendered += 1
+    assert rendered > 0
+
+
+@pytest.mark.parametrize("spec_file", SPECS)
+@pytest.mark.parametrize("status", [200, "200"])
+def test_body_for_accepts_int_and_str_status(spec_file, status):
+    spec, operations = load_and_parse_swagger(spec_file)
+    body = TemplateEngine(spec).body_for(operations["/pet/{petId}"]["get"], status)
+
+    assert set(_render(body)) >= {"id", "name", "photoUrls", "status"}
+
+
+@pytest.mark.parametrize("spec_file", SPECS)
+def test_success_body_for_both_spec_versions(spec_file):
+    spec, operations = load_and_parse_swagger(spec_file)
+    status, body = TemplateEngine(spec).success_body(operations["/pet/{petId}"]["get"])
+
+    assert status == 200
+    assert _render(body)["category"].keys() == {"id", "name"}
+
+
+def test_request_fields_are_echoed():
+    spec, operations = load_and_parse_swagger("input/openapi.yaml")
+    body = TemplateEngine(spec).body_for(operations["/pet"]["post"], 200)
+
+    rendered = _render(body, {"name": "Rex", "id": 7, "status": "sold"})
+    assert (rendered["name"], rendered["id"], rendered["status"]) == ("Rex", 7, "sold")
+    assert _render(body)["id"] == 0
+
+
+def test_shared_components_compile_once():
+    spec, operations = load_and_parse_swagger("input/openapi.yaml")
+    engine = TemplateEngine(spec)
+    first = engine.compile({"$ref": "#/components/schemas/Pet"})
+
+    engine.body_for(operations["/pet/{petId}"]["get"], 200)
+    assert engine.compile({"$ref": "#/components/schemas/Pet"}) is first
+
+
+def test_recursive_schema_terminates():
+    spec = {"definitions": {"Node": {"type": "object", "properties": {
+        "name": {"type": "string"}, "child": {"$ref": "#/definitions/Node"}}}}}
+    body = TemplateEngine(spec).compile({"$ref": "#/definitions/Node"}).static
+
+    assert json.loads(render_template(compile_template(body), RequestContext("GET", "/")))["child"] is None
+
+
+def test_resolve_ref_strips_prefix_only():
+    spec = {"#Odd": {"type": "integer"}, "definitions": {"a/b": {"type": "string"}}}
+
+    assert resolve_ref({"$ref": "#/#Odd"}, spec) == ("#/#Odd", {"type": "integer"})
+    assert resolve_ref({"$ref": "#/definitions/a~1b"}, spec)[1] == {"type": "string"}
+    assert resolve_ref({"$ref": "#/definitions/missing"}, spec)[1] == {}
+    assert resolve_ref({"$ref": "#/definitions/missing"}, None) == ("#/definitions/missing", {})
@@ -0,0 +1,219 @@
+import time
+import logging
+import threading
+
+# Rough characters-per-token ratio used when a provider does not report usage
+CHARS_PER_TOKEN = 4
+
+STAGE_MAPPING = "mapping"
+STAGE_TEST_DESCRIPTION = "test_description"
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised before an LLM call once a run-level budget has been used up."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the token count of a text when the provider does not report it."""
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+def _new_stats() -> dict:
+    return {
+        "calls": 0,
+        "failed_calls": 0,
+        "attempts": 0,
+        "failed_attempts": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "estimated_calls": 0,
+        "latency_seconds": 0.0,
+    }
+
+
+class RunMeter:
+    """
+    Tracks LLM usage for a run and enforces token, request and wall-time budgets.
+
+    Usage is aggregated overall, per operation, per stage (mapping vs. test
+    description) and per API key. Per-key stats count every attempt made with the
+    key and its latency; calls and tokens go to the key that returned the response. A budget value
+    of 0 or None means unlimited.
+    """
+
+    def __init__(self, max_tokens: int = None, max_requests: int = None, max_wall_seconds: float = None):
+        self.max_tokens = max_tokens or None
+        self.max_requests = max_requests or None
+        self.max_wall_seconds = max_wall_seconds or None
+        self.started = time.perf_counter()
+        self.totals = _new_stats()
+        self.by_operation = {}
+        self.by_stage = {}
+        self.by_key = {}
+        self.exhausted_reason = None
+        # Provider requests started so far, counted live for the request budget
+        self.requests_started = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        budget = config.get("budget", {}) or {}
+        return cls(
+            max_tokens=budget.get("max_tokens"),
+            max_requests=budget.get("max_requests"),
+            max_wall_seconds=budget.get("max_wall_seconds"),
+        )
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def check_budget(self):
+        """
+        Raises BudgetExceededError if any budget is used up. Once exhausted, the
+        budget stays exhausted for the rest of the run.
+        """
+        with self._lock:
+            if self.exhausted_reason is None:
+                if self.max_tokens and self.totals["total_tokens"] >= self.max_tokens:
+                    self.exhausted_reason = f"token budget of {self.max_tokens} reached"
+                elif self.max_requests and self.requests_started >= self.max_requests:
+                    self.exhausted_reason = f"request budget of {self.max_requests} reached"
+                elif self.max_wall_seconds and self.elapsed() >= self.max_wall_seconds:
+                    self.exhausted_reason = f"wall-time budget of {self.max_wall_seconds}s reached"
+                if self.exhausted_reason:
+                    logging.warning(f"💸 Run budget exhausted: {self.exhausted_reason}. "
+                                    "Falling back to deterministic generation.")
+            reason = self.exhausted_reason
+
+        if reason:
+            raise BudgetExceededError(f"Run budget exhausted: {reason}")
+
+    def begin_attempt(self):
+        """
+        Checks the budget and counts one provider request. Called before every
+        attempt, including retries, so the request budget is never overshot.
+        """
+        self.check_budget()
+        with self._lock:
+            self.requests_started += 1
+
+    def record(self, stage: str, operation: str, usage: dict, prompt: str, response_text: str,
+               latency_seconds: float, success: bool = True):
+        """
+        Records one logical LLM call (including its retries).
+
+        Args:
+            stage (str): Pipeline stage, e.g. STAGE_MAPPING.
+            operation (str): Operation label, e.g. 'POST /pet'.
+            usage (dict): Filled by the provider: prompt_tokens, completion_tokens and
+                attempts, a list of [api_key, succeeded, seconds] entries. Missing
+                token counts of successful calls are estimated.
+            prompt (str): Prompt text, used for estimation.
+            response_text (str): Response text, used for estimation (None on failure).
+            latency_seconds (float): Wall time of the call including retries.
+            success (bool): Whether a response was obtained.
+        """
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        estimated = False
+        if success:
+            if prompt_tokens is None:
+                prompt_tokens = estimate_tokens(prompt)
+                estimated = True
+            if completion_tokens is None:
+                completion_tokens = estimate_tokens(response_text)
+                estimated = True
+        # Calls without a response are not billed, so they only count as attempts
+        prompt_tokens = prompt_tokens or 0
+        completion_tokens = completion_tokens or 0
+
+        attempts = usage.get("attempts", [])
+        failed_attempts = sum(1 for _, ok, _ in attempts if not ok)
+
+        with self._lock:
+            for bucket in (
+                self.totals,
+                self.by_operation.setdefault(operation or "unknown", _new_stats()),
+                self.by_stage.setdefault(stage or "unknown", _new_stats()),
+            ):
+                bucket["calls"] += 1
+                bucket["failed_calls"] += 0 if success else 1
+                bucket["attempts"] += len(attempts)
+                bucket["failed_attempts"] += failed_attempts
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["total_tokens"] += prompt_tokens + completion_tokens
+                bucket["estimated_calls"] += 1 if estimated else 0
+                bucket["latency_seconds"] += latency_seconds
+
+            for key, ok, seconds in attempts:
+                bucket = self.by_key.setdefault(f"...{key[-4:]}" if key else "n/a", _new_stats())
+                bucket["attempts"] += 1
+                bucket["latency_seconds"] += seconds
+                if not ok:
+                    bucket["failed_attempts"] += 1
+                    continue
+                bucket["calls"] += 1
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["total_tokens"] += prompt_tokens + completion_tokens
+                bucket["estimated_calls"] += 1 if estimated else 0
+
+    def report(self) -> dict:
+        """Builds the run report including throughput (calls/sec, tokens/sec)."""
+        elapsed = self.elapsed()
+
+        def summarize(stats):
+            summary = dict(stats)
+            summary["latency_seconds"] = round(stats["latency_seconds"], 3)
+            summary["mean_latency_seconds"] = round(stats["latency_seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+            return summary
+
+        with self._lock:
+            return {
+                "wall_seconds": round(elapsed, 3),
+                "calls_per_second": round(self.totals["calls"] / elapsed, 3) if elapsed else 0.0,
+                "tokens_per_second": round(self.totals["total_tokens"] / elapsed, 3) if elapsed else 0.0,
+                "budget": {
+                    "max_tokens": self.max_tokens,
+                    "max_requests": self.max_requests,
+                    "max_wall_seconds": self.max_wall_seconds,
+                    "exhausted_reason": self.exhausted_reason,
+                },
+                "totals": summarize(self.totals),
+                "by_stage": {k: summarize(v) for k, v in self.by_stage.items()},
+                "by_operation": {k: summarize(v) for k, v in self.by_operation.items()},
+                "by_key": {k: summarize(v) for k, v in self.by_key.items()},
+            }
+
+    def log_report(self) -> dict:
+        """Logs a short summary of the run and returns the full report."""
+        report = self.report()
+        totals = report["totals"]
+        logging.info(f"📈 LLM usage: {totals['calls']} call(s), {totals['attempts']} request(s), "
+                     f"{totals['total_tokens']} token(s) ({totals['estimated_calls']} estimated) "
+                     f"in {report['wall_seconds']}s")
+        logging.info(f"⚡ Throughput: {report['calls_per_second']} calls/sec | "
+                     f"{report['tokens_per_second']} tokens/sec")
+        for stage, stats in report["by_stage"].items():
+            logging.info(f"   {stage}: {stats['calls']} call(s), {stats['total_tokens']} token(s), "
+                         f"mean latency {stats['mean_latency_seconds']}s")
+        if self.exhausted_reason:
+            logging.warning(f"💸 Budget exhausted during run: {self.exhausted_reason}")
+        return report
+
+
+# Meter for the current run; None means LLM calls are not metered
+_active_meter = None
+
+
+def start_run(config: dict) -> RunMeter:
+    """Creates the run meter from config and makes it active for all LLM calls."""
+    global _active_meter
+    _active_meter = RunMeter.from_config(config)
+    return _active_meter
+
+
+def get_active_meter():
+    return _active_meter
@@ -4,6 +4,8 @@ import logging
 import yaml
 import functools  # ✅ ADD THIS
 
+from utils.metering import BudgetExceededError
+
 # Load API keys from config/keys.yaml
 def load_api_keys(provider):
     with open("config/keys.yaml", "r") as f:
@@ -28,6 +30,9 @@ def retry_with_key_rotation(provider, config):
 
                 try:
                     return api_function(*args, **kwargs)
+                except BudgetExceededError:
+                    # Retrying cannot help once the run budget is used up
+                    raise
                 except Exception as e:
                     logging.warning(f"Attempt {attempt}/{max_attempts} failed with key ending in {current_key[-4:]}. Reason: {e}")
                     if attempt < max_attempts:
@@ -0,0 +1,30 @@
+# Nesting limit when walking schemas, guarding against deep or recursive components
+MAX_SCHEMA_DEPTH = 8
+
+
+def resolve_ref(schema, spec):
+    """
+    Follows a chain of local `$ref`s (e.g. '#/components/schemas/Pet') inside the spec.
+
+    Args:
+        schema (dict): Schema that may be a `$ref`.
+        spec (dict): Full parsed spec the reference points into.
+
+    Returns:
+        tuple: (last `$ref` followed or None, resolved schema). Unresolvable or
+        circular references resolve to an empty schema.
+    """
+    ref = None
+    seen = set()
+    while isinstance(schema, dict) and "$ref" in schema:
+        ref = schema["$ref"]
+        if not spec or ref in seen:
+            return ref, {}
+        seen.add(ref)
+
+        node = spec
+        for part in ref.removeprefix("#/").split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            node = node.get(part, {}) if isinstance(node, dict) else {}
+        schema = node
+    return ref, schema or {}